@@ -19,22 +19,21 @@
 #
 ###############################################################################
 
-import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 import os
 import shutil
+import tempfile
 import zipfile
 
 import click
 
-from pywis_topics.util import (get_cli_common_options, get_userdir, urlopen_,
-                               setup_logger)
+from pywis_topics.util import (USERDIR, WIS2_TOPIC_HIERARCHY_LOOKUP,
+                               get_cli_common_options, urlopen_, setup_logger)
 
 LOGGER = logging.getLogger(__name__)
 
-USERDIR = get_userdir()
-
-WIS2_TOPIC_HIERARCHY_DIR = get_userdir() / 'wis2-topic-hierarchy'
+COPY_BUFSIZE = 256 * 1024
 
 
 @click.group()
@@ -43,6 +42,47 @@ def bundle():
     pass
 
 
+def sync_topic_hierarchy() -> None:
+    """
+    Download and extract WIS2 topic hierarchy tables
+
+    :returns: `None`
+    """
+
+    LOGGER.debug('Downloading WIS2 topic hierarchy')
+    ZIPFILE_URL = 'https://wmo-im.github.io/wis2-topic-hierarchy/wth-bundle.zip'  # noqa
+    with tempfile.TemporaryFile() as fh:
+        with urlopen_(ZIPFILE_URL) as response:
+            shutil.copyfileobj(response, fh, COPY_BUFSIZE)
+
+        fh.seek(0)
+
+        with zipfile.ZipFile(fh) as z:
+            LOGGER.debug(f'Processing zipfile "{z.filename}"')
+            for name in z.namelist():
+                LOGGER.debug(f'Processing entry "{name}"')
+                filename = os.path.basename(name)
+
+                dest_file = WIS2_TOPIC_HIERARCHY_LOOKUP / filename
+                LOGGER.debug(f'Creating "{dest_file}"')
+                with z.open(name) as src, dest_file.open('wb') as dest:
+                    shutil.copyfileobj(src, dest, COPY_BUFSIZE)
+
+
+def sync_tlds() -> None:
+    """
+    Download IANA TLDs
+
+    :returns: `None`
+    """
+
+    LOGGER.debug('Downloading IANA TLDs')
+    IANA_URL = 'https://data.iana.org/TLD/tlds-alpha-by-domain.txt'
+    iana_file = WIS2_TOPIC_HIERARCHY_LOOKUP / 'tlds-alpha-by-domain.txt'
+    with urlopen_(IANA_URL) as response, iana_file.open('wb') as fh:
+        shutil.copyfileobj(response, fh, COPY_BUFSIZE)
+
+
 def sync_bundle() -> None:
     """
     Sync bundle locally to ~/.pywis-topics
@@ -55,27 +95,15 @@ def sync_bundle() -> None:
     if USERDIR.exists():
         shutil.rmtree(USERDIR)
 
-    LOGGER.debug('Downloading WIS2 topic hierarchy')
-    WIS2_TOPIC_HIERARCHY_DIR.mkdir(parents=True, exist_ok=True)
-
-    ZIPFILE_URL = 'https://wmo-im.github.io/wis2-topic-hierarchy/wth-bundle.zip'  # noqa
-    FH = io.BytesIO(urlopen_(ZIPFILE_URL).read())
-    with zipfile.ZipFile(FH) as z:
-        LOGGER.debug(f'Processing zipfile "{z.filename}"')
-        for name in z.namelist():
-            LOGGER.debug(f'Processing entry "{name}"')
-            filename = os.path.basename(name)
-
-            dest_file = WIS2_TOPIC_HIERARCHY_DIR / filename
-            LOGGER.debug(f'Creating "{dest_file}"')
-            with z.open(name) as src, dest_file.open('wb') as dest:
-                shutil.copyfileobj(src, dest)
+    WIS2_TOPIC_HIERARCHY_LOOKUP.mkdir(parents=True, exist_ok=True)
 
-    LOGGER.debug('Downloading IANA TLDs')
-    IANA_URL = 'https://data.iana.org/TLD/tlds-alpha-by-domain.txt'
-    iana_file = WIS2_TOPIC_HIERARCHY_DIR / 'tlds-alpha-by-domain.txt'
-    with iana_file.open('wb') as fh:
-        fh.write(urlopen_(f'{IANA_URL}').read())
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(sync_topic_hierarchy),
+            executor.submit(sync_tlds)
+        ]
+        for future in as_completed(futures):
+            future.result()
 
 
 @click.command()
@@ -19,19 +19,37 @@
 #
 ###############################################################################
 
-import csv
+from functools import lru_cache
 import logging
 from pathlib import Path
 
 import click
 
-from pywis_topics.topics import TopicHierarchy, validate_baseline
-from pywis_topics.util import get_cli_common_options, get_userdir, setup_logger
+from pywis_topics.topics import (TABLES_CACHE_SIZE, TopicHierarchy,
+                                 validate_baseline)
+from pywis_topics.util import (WIS2_TOPIC_HIERARCHY_LOOKUP,
+                               get_cli_common_options, setup_logger)
 
 LOGGER = logging.getLogger(__name__)
 
 
-WIS2_TOPIC_HIERARCHY_LOOKUP = Path(get_userdir()) / 'wis2-topic-hierarchy'
+@lru_cache(maxsize=TABLES_CACHE_SIZE)
+def _load_tlds(tables_dir: Path, mtime: float) -> frozenset:
+    """
+    Loads IANA top level domains
+
+    :param tables_dir: `Path` of topic hierarchy tables directory
+    :param mtime: `float` of tables directory modification time
+
+    :returns: `frozenset` of uppercase TLDs
+    """
+
+    tld_file = tables_dir / 'tlds-alpha-by-domain.txt'
+
+    with tld_file.open() as fh:
+        next(fh)
+        return frozenset(line.strip().upper() for line in fh
+                         if line.strip())
 
 
 class CentreId:
@@ -52,6 +70,8 @@ class CentreId:
             msg = 'Invalid number of centre-id tokens'
             raise ValueError(msg)
 
+        self.tables = tables
+
         if tables is not None:
             self.tables_dir = Path(tables) / 'wis2-topic-hierarchy'
         else:
@@ -69,24 +89,14 @@ class CentreId:
             return False
 
         LOGGER.debug('Validating TLD component')
-        tld_valid = False
-        tld_upper = self.tld.upper()
-
-        tld_file = self.tables_dir / 'tlds-alpha-by-domain.txt'
-        with tld_file.open() as fh:
-            reader = csv.reader(fh)
-            next(reader)
-            for row in reader:
-                if tld_upper == row[0]:
-                    tld_valid = True
-                    break
-
-        if not tld_valid:
+        tlds = _load_tlds(self.tables_dir, self.tables_dir.stat().st_mtime)
+
+        if self.tld.upper() not in tlds:
             LOGGER.warning('Invalid TLD')
             return False
 
         LOGGER.debug('Checking for uniqueness')
-        topics = TopicHierarchy()
+        topics = TopicHierarchy.instance(self.tables)
         if self.centre_id in topics.topics[3]:
             LOGGER.warning('centre-id is already allocated')
             return False
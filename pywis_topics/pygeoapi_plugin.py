@@ -189,9 +189,8 @@ class WIS2TopicHierarchyListTopicsProcessor(BaseProcessor):
             raise ProcessorExecuteError(msg)
 
         LOGGER.debug('Querying topic')
-        th = TopicHierarchy()
         try:
-            matching_topics = th.list_children(topic)
+            matching_topics = TopicHierarchy.instance().list_children(topic)
             response = {
                 'topics': matching_topics
             }
@@ -230,9 +229,8 @@ class WIS2TopicHierarchyValidateTopicProcessor(BaseProcessor):
             raise ProcessorExecuteError(msg)
 
         LOGGER.debug('Querying topic')
-        th = TopicHierarchy()
         response = {
-            'topic_is_valid': th.validate(topic)
+            'topic_is_valid': TopicHierarchy.instance().validate(topic)
         }
         return mimetype, response
 
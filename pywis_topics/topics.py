@@ -19,20 +19,169 @@
 #
 ###############################################################################
 
+from concurrent.futures import ThreadPoolExecutor
 import csv
+from functools import lru_cache
 import logging
 from pathlib import Path
 import re
-from typing import List
+from typing import List, Tuple
 
 import click
 
-from pywis_topics.util import get_cli_common_options, get_userdir, setup_logger
+from pywis_topics.util import (WIS2_TOPIC_HIERARCHY_LOOKUP,
+                               get_cli_common_options, setup_logger)
 
 LOGGER = logging.getLogger(__name__)
 
+TOPIC_LEVELS = [
+    'channel',
+    'version',
+    'system',
+    'centre-id',
+    'notification-type',
+    'data-policy',
+    'earth-system-discipline'
+]
 
-WIS2_TOPIC_HIERARCHY_LOOKUP = Path(get_userdir()) / 'wis2-topic-hierarchy'
+TABLES_CACHE_SIZE = 8
+
+CHILDREN_CACHE_SIZE = 1024
+
+VALIDATE_CACHE_SIZE = 4096
+
+COMMON_TOPIC_PREFIX = 'origin/a/wis2/'
+
+# ASCII only (checked separately), at least one lowercase letter, no
+# uppercase letters or dots, and a multi-level wildcard only at the end
+BASELINE_PATTERN = re.compile(r'(?=[^a-z]*[a-z])[^.#A-Z]*#?')
+
+
+def _load_level(filename: Path) -> frozenset:
+    """
+    Loads a topic hierarchy table
+
+    :param filename: `Path` of topic hierarchy table
+
+    :returns: `frozenset` of topics
+    """
+
+    with filename.open(newline='') as fh:
+        reader = csv.reader(fh)
+        next(reader)
+
+        return frozenset(row[0] for row in reader if row)
+
+
+@lru_cache(maxsize=TABLES_CACHE_SIZE)
+def _load_topics(tables_dir: Path, mtime: float) -> tuple:
+    """
+    Loads topic hierarchy tables
+
+    Results are cached, keyed on the tables directory and its modification
+    time, so that tables are only re-read after a bundle sync
+
+    :param tables_dir: `Path` of topic hierarchy tables directory
+    :param mtime: `float` of tables directory modification time
+
+    :returns: `tuple` of `frozenset` of topics, one per topic level
+    """
+
+    LOGGER.debug('Loading topic hierarchy tables from %s', tables_dir)
+
+    filenames = [tables_dir / f'{level}.csv' for level in TOPIC_LEVELS]
+
+    with ThreadPoolExecutor(max_workers=len(filenames)) as executor:
+        return tuple(executor.map(_load_level, filenames))
+
+
+def _index_children(esd_topics: frozenset) -> dict:
+    """
+    Indexes Earth system discipline topics by parent topic
+
+    :param esd_topics: `frozenset` of Earth system discipline topics
+
+    :returns: `dict` of parent topic to sorted `tuple` of child topic tokens
+    """
+
+    children = {}
+
+    for esd_topic in esd_topics:
+        start = esd_topic.find('/')
+        while start != -1:
+            end = esd_topic.find('/', start + 1)
+            if end == -1:
+                child = esd_topic[start + 1:]
+            else:
+                child = esd_topic[start + 1:end]
+
+            children.setdefault(esd_topic[:start], set()).add(child)
+            start = end
+
+    return {key: tuple(sorted(value)) for key, value in children.items()}
+
+
+@lru_cache(maxsize=TABLES_CACHE_SIZE)
+def _index_topics(topics: tuple) -> dict:
+    """
+    Derives lookups from topic hierarchy tables
+
+    :param topics: `tuple` of `frozenset` of topics, one per topic level
+
+    :returns: `dict` of lookups, shared between instances
+    """
+
+    core_topics = topics[:6]
+    prefix_tokens = COMMON_TOPIC_PREFIX.split('/')[:-1]
+
+    return {
+        'core_children': tuple(tuple(sorted(level)) for level in core_topics),
+        'esd_children': _index_children(topics[6]),
+        'esd_roots': tuple(sorted({t.partition('/')[0] for t in topics[6]})),
+        'esd_tokens': tuple(tuple(t.split('/')) for t in topics[6]),
+        # per core level sets of accepted tokens: empty tokens are skipped,
+        # wildcards are accepted in non-strict mode, and None accepts any
+        # centre-id in non-strict mode
+        'core_validators': {
+            True: tuple(level | {''} for level in core_topics),
+            False: tuple(None if count == 3 else level | {'', '+', '#'}
+                         for count, level in enumerate(core_topics))
+        },
+        'common_prefix_offset': len(prefix_tokens),
+        'common_prefix_valid': all(
+            token in topics[count]
+            for count, token in enumerate(prefix_tokens))
+    }
+
+
+def _get_tables_dir(tables: str = None) -> Path:
+    """
+    Gets topic hierarchy tables directory
+
+    :param tables: location of base directory for bundle
+
+    :returns: `Path` of topic hierarchy tables directory
+    """
+
+    if tables is not None:
+        return Path(tables) / 'wis2-topic-hierarchy'
+    else:
+        return WIS2_TOPIC_HIERARCHY_LOOKUP
+
+
+@lru_cache(maxsize=TABLES_CACHE_SIZE)
+def _get_instance(cls: type, tables: str, mtime: float):
+    """
+    Gets a cached topic hierarchy instance
+
+    :param cls: `TopicHierarchy` class
+    :param tables: location of base directory for bundle
+    :param mtime: `float` of tables directory modification time
+
+    :returns: `pywis_topics.topics.TopicHierarchy`
+    """
+
+    return cls(tables)
 
 
 class TopicHierarchy:
@@ -45,83 +194,82 @@ class TopicHierarchy:
         :returns: `pywis_topics.topics_TopicHierarchy`
         """
 
-        self.topics = []
+        tables_dir = _get_tables_dir(tables)
 
-        topic_levels = [
-            'channel',
-            'version',
-            'system',
-            'centre-id',
-            'notification-type',
-            'data-policy',
-            'earth-system-discipline'
-        ]
+        self.topics = _load_topics(tables_dir, tables_dir.stat().st_mtime)
 
-        if tables is not None:
-            tables_dir = Path(tables) / 'wis2-topic-hierarchy'
-        else:
-            tables_dir = WIS2_TOPIC_HIERARCHY_LOOKUP
+        lookups = _index_topics(self.topics)
+        self._esd_children = lookups['esd_children']
+        self._core_children = lookups['core_children']
+        self._root_children = self._core_children[0]
+        self._esd_roots = lookups['esd_roots']
+        self._esd_tokens = lookups['esd_tokens']
+        self._core_validators = lookups['core_validators']
+        self._common_prefix_offset = lookups['common_prefix_offset']
+        self._common_prefix_valid = lookups['common_prefix_valid']
+
+        self._children_cache = {}
+        self._validate_cached = lru_cache(maxsize=VALIDATE_CACHE_SIZE)(
+            self._validate_topic)
+
+    @classmethod
+    def instance(cls, tables: str = None) -> 'TopicHierarchy':
+        """
+        Gets a shared instance for a given tables location
+
+        Instances are cached per tables location, and replaced once the
+        tables are re-synced
+
+        :param tables: location of base directory for bundle
+
+        :returns: `pywis_topics.topics.TopicHierarchy`
+        """
 
-        for topic_level in topic_levels:
-            filename = tables_dir / f'{topic_level}.csv'
-            with filename.open() as fh:
-                level_topics = []
-                reader = csv.reader(fh)
-                next(reader)
-                for row in reader:
-                    level_topics.append(row[0])
+        tables_dir = _get_tables_dir(tables)
 
-                self.topics.append(level_topics)
+        return _get_instance(cls, tables, tables_dir.stat().st_mtime)
 
-    def list_children(self, topic_hierarchy: str = None) -> List[str]:
+    def list_children(self, topic_hierarchy: str = None) -> Tuple[str, ...]:
         """
         Lists children at a given level of a topic hierarchy
 
         :param topic_hierarchy: `str` of topic hierarchy
 
-        :returns: `list` of topic children
+        :returns: `tuple` of topic children
         """
 
-        matches = []
+        if topic_hierarchy in self._children_cache:
+            LOGGER.debug('Returning cached topic children')
+            return self._children_cache[topic_hierarchy]
 
         if topic_hierarchy == '/':
             LOGGER.debug('Dumping root topic children')
-            return self.topics[0]
+            return self._root_children
 
-        if not self.validate(topic_hierarchy):
-            msg = 'Invalid topic'
-            LOGGER.info(msg)
+        if topic_hierarchy is None:
+            msg = 'Topic hierarchy is empty'
+            LOGGER.warning(msg)
             raise ValueError(msg)
 
-        th_tokens = topic_hierarchy.split('/', 6)
-        num_th_tokens = len(th_tokens)
+        validate_baseline(topic_hierarchy)
 
-        if num_th_tokens < 6:
-            LOGGER.debug('Listing core topics')
-            subtopics = set(self.topics[len(th_tokens)])
-        elif num_th_tokens == 6:
-            LOGGER.debug('Listing earth system discipline topics')
-            subtopics = set([t.split('/')[0] for t in self.topics[6]])
-        else:
-            LOGGER.debug('Listing domain topics')
-            subtopics_to_add = []
-            domain_topic = th_tokens[-1]
-            for subtopic in self.topics[-1]:
-                if subtopic.startswith(domain_topic):
-                    if subtopic != domain_topic:
-                        mask = subtopic.replace(f'{domain_topic}/', '')
-                        if mask:
-                            subtopics_to_add.append(mask.split('/')[0])
+        th_tokens = topic_hierarchy.split('/', 6)
 
-            subtopics = set(subtopics_to_add)
+        if not self._validate_tokens(th_tokens):
+            msg = 'Invalid topic'
+            LOGGER.info(msg)
+            raise ValueError(msg)
 
-        matches.extend(subtopics)
+        matches = self._list_children_tokens(th_tokens)
 
         if not matches:
             msg = f'No matching topics for {topic_hierarchy}'
             LOGGER.info(msg)
             raise ValueError(msg)
 
+        if len(self._children_cache) < CHILDREN_CACHE_SIZE:
+            self._children_cache[topic_hierarchy] = matches
+
         return matches
 
     def validate(self, topic_hierarchy: str = None,
@@ -136,7 +284,22 @@ class TopicHierarchy:
         :returns: `bool` of whether topic hierarchy is valid
         """
 
-        LOGGER.debug(f'Validating topic hierarchy {topic_hierarchy}')
+        strict = bool(strict)
+
+        return self._validate_cached(topic_hierarchy, strict)
+
+    def _validate_topic(self, topic_hierarchy: str, strict: bool) -> bool:
+        """
+        Validates a topic hierarchy (uncached)
+
+        :param topic_hierarchy: `str` of topic hierarchy
+        :param strict: `bool` of whether to perform strict validation,
+                       including centre-id
+
+        :returns: `bool` of whether topic hierarchy is valid
+        """
+
+        LOGGER.debug('Validating topic hierarchy %s', topic_hierarchy)
 
         if topic_hierarchy in ['/', None]:
             msg = 'Topic hierarchy is empty'
@@ -145,15 +308,103 @@ class TopicHierarchy:
 
         validate_baseline(topic_hierarchy)
 
-        all_tokens = topic_hierarchy.split('/')
-        core_tokens = all_tokens[:6]
-        esd_subtopic = '/'.join(all_tokens[6:])
+        if (self._common_prefix_valid and
+                topic_hierarchy.startswith(COMMON_TOPIC_PREFIX)):
+            LOGGER.debug('Skipping known prefix %s', COMMON_TOPIC_PREFIX)
+            offset = self._common_prefix_offset
+            th_tokens = topic_hierarchy[len(COMMON_TOPIC_PREFIX):].split(
+                '/', 6 - offset)
+            return self._validate_tokens(th_tokens, strict, offset)
+
+        channel = topic_hierarchy.partition('/')[0]
+        if channel not in self._core_validators[strict][0]:
+            LOGGER.debug('Invalid channel')
+            return False
+
+        return self._validate_tokens(topic_hierarchy.split('/', 6), strict)
+
+    def validate_many(self, topic_hierarchies: List[str],
+                      strict: bool = True) -> List[bool]:
+        """
+        Validates multiple topic hierarchies
+
+        Topic hierarchies which cannot be validated (e.g. empty) are
+        reported as invalid
+
+        :param topic_hierarchies: `list` of topic hierarchies
+        :param strict: `bool` of whether to perform strict validation,
+                       including centre-id
+
+        :returns: `list` of `bool` of whether each topic hierarchy is valid
+        """
+
+        validate = self.validate
+        results = []
+
+        for topic_hierarchy in topic_hierarchies:
+            try:
+                results.append(validate(topic_hierarchy, strict))
+            except ValueError as err:
+                LOGGER.debug('Invalid topic hierarchy: %s', err)
+                results.append(False)
+
+        return results
+
+    def _list_children_tokens(self, th_tokens: list) -> tuple:
+        """
+        Lists children of a validated, split topic hierarchy
+
+        :param th_tokens: `list` of topic hierarchy tokens, split into
+                          core tokens and Earth system discipline subtopic
+
+        :returns: `tuple` of topic children
+        """
+
+        num_th_tokens = len(th_tokens)
+
+        if num_th_tokens < 6:
+            LOGGER.debug('Listing core topics')
+            subtopics = self._core_children[num_th_tokens]
+        elif num_th_tokens == 6:
+            LOGGER.debug('Listing earth system discipline topics')
+            subtopics = self._esd_roots
+        else:
+            LOGGER.debug('Listing domain topics')
+            subtopics = self._esd_children.get(th_tokens[-1], ())
+
+        return subtopics
+
+    def _validate_tokens(self, th_tokens: list, strict: bool = True,
+                         offset: int = 0) -> bool:
+        """
+        Validates a split topic hierarchy
+
+        :param th_tokens: `list` of topic hierarchy tokens, split into
+                          core tokens and Earth system discipline subtopic
+        :param strict: `bool` of whether to perform strict validation,
+                       including centre-id
+        :param offset: `int` of topic level of the first token
+
+        :returns: `bool` of whether topic hierarchy is valid
+        """
+
+        num_core_tokens = 6 - offset
+        core_tokens = th_tokens[:num_core_tokens]
+        if len(th_tokens) > num_core_tokens:
+            esd_subtopic = th_tokens[num_core_tokens]
+        else:
+            esd_subtopic = ''
+
+        LOGGER.debug('Core tokens: %s', core_tokens)
+        LOGGER.debug('Earth system discipline subtopic: %s', esd_subtopic)
+
+        if '#' in th_tokens[:-1]:
+            LOGGER.debug('Multi-level wildcard can only be last')
+            return False
 
-        LOGGER.debug(f'Core tokens: {core_tokens}')
-        LOGGER.debug(f'Earth system discipline subtopic: {esd_subtopic}')
         LOGGER.debug('Validating core tokens')
 
-        if not self._validate_core(core_tokens, strict):
+        if not self._validate_core(core_tokens, strict, offset):
             LOGGER.debug('Core tokens are invalid')
             return False
 
@@ -167,34 +418,29 @@ class TopicHierarchy:
 
         return True
 
-    def _validate_core(self, core_tokens: list, strict: bool = True) -> bool:
+    def _validate_core(self, core_tokens: list, strict: bool = True,
+                       offset: int = 0) -> bool:
         """
         Validates core topic tokens
 
         :param core_tokens: `list` of core tokens
         :param strict: `bool` of whether to perform strict validation,
                        including centre-id
+        :param offset: `int` of topic level of the first token
 
         :returns: `bool` of whether topic hierarchy is valid
         """
 
-        for count, value in enumerate(core_tokens):
-            if value in [None, '']:
-                continue
-            if not strict and count == 3:
-                LOGGER.debug('Skipping centre-id validation')
+        validators = self._core_validators[strict]
+
+        for count, value in enumerate(core_tokens, offset):
+            valid_tokens = validators[count]
+            if valid_tokens is None or value in valid_tokens:
                 continue
-            elif value in ['+', '#']:
-                if not strict:
-                    LOGGER.debug('Skipping wildcard')
-                    continue
-                else:
-                    return False
-
-            if count == 3 and value.endswith('-test'):
+            elif count == 3 and value.endswith('-test'):
                 LOGGER.debug('Skipping test centre-id')
                 continue
-            elif value not in self.topics[count]:
+            else:
                 return False
 
         return True
@@ -210,50 +456,55 @@ class TopicHierarchy:
         :returns: `bool` of whether topic hierarchy is valid
         """
 
-        is_valid = False
+        if esd_subtopic in self.topics[-1]:
+            LOGGER.debug('Subtopic found')
+            return True
 
         if strict:
             LOGGER.debug('Validating subtopic with strict mode')
-            is_experimental = '/experimental' in esd_subtopic
-            return any([esd_subtopic in self.topics[-1] or is_experimental])
+            return '/experimental' in esd_subtopic
 
         tokens = esd_subtopic.split('/')
         if len(tokens) > 1 and tokens[1] == 'experimental':
             LOGGER.debug('Experimental topic found, skipping')
             return True
 
-        regex = esd_subtopic
-        if '+' in regex:
-            regex = regex.replace('+', r'(\w+|\+)')
-        if '#' in regex:
-            regex = regex.replace('#', r'.*')
+        debug = LOGGER.isEnabledFor(logging.DEBUG)
 
-        regex = f'^{regex}$'
+        for esd_tokens in self._esd_tokens:
+            if debug:
+                LOGGER.debug('Testing %s against %s', esd_tokens, tokens)
+            if match_topic_filter(tokens, esd_tokens):
+                LOGGER.debug('Match')
+                return True
 
-        LOGGER.debug(regex)
+        return False
 
-        for esd in self.topics[-1]:
-            LOGGER.debug(f'Testing {esd} against {regex}')
-            match = re.search(regex, esd)
-            if not match:
-                LOGGER.debug('No match')
-            else:
-                LOGGER.debug('Match')
-                last_token_match = False
-                if not esd.endswith('#'):
-                    esd_last_token = esd.split('/')[-1]
-                    regex_last_token = (regex.split('/')[-1].replace('$', '')
-                                        .replace('.*', '')
-                                        .replace('^', ''))
-                    if regex_last_token == '':
-                        last_token_match = True
-                    elif esd_last_token == regex_last_token:
-                        last_token_match = True
 
-                if last_token_match:
-                    is_valid = True
+def match_topic_filter(filter_tokens: list, topic_tokens: list) -> bool:
+    """
+    Matches topic tokens against MQTT topic filter tokens
+
+    `+` matches any single topic level, and `#` (last token only) matches
+    any number of remaining topic levels, including none
 
-        return is_valid
+    :param filter_tokens: `list` of topic filter tokens
+    :param topic_tokens: `list` of topic tokens
+
+    :returns: `bool` of whether topic matches topic filter
+    """
+
+    num_topic_tokens = len(topic_tokens)
+
+    for count, filter_token in enumerate(filter_tokens):
+        if filter_token == '#':
+            return count == len(filter_tokens) - 1
+        if count >= num_topic_tokens:
+            return False
+        if filter_token != '+' and filter_token != topic_tokens[count]:
+            return False
+
+    return len(filter_tokens) == num_topic_tokens
 
 
 def validate_baseline(topic_hierarchy: str = None) -> bool:
@@ -266,6 +517,10 @@ def validate_baseline(topic_hierarchy: str = None) -> bool:
               conventions
     """
 
+    if (topic_hierarchy.isascii() and
+            BASELINE_PATTERN.fullmatch(topic_hierarchy)):
+        return True
+
     if '.' in topic_hierarchy:
         msg = 'Topic cannot contain dots'
         LOGGER.warning(msg)
@@ -305,7 +560,7 @@ def list_(ctx, topic_hierarchy, logfile, verbosity):
 
     setup_logger(verbosity, logfile)
 
-    th = TopicHierarchy()
+    th = TopicHierarchy.instance()
 
     try:
         matching_topics = th.list_children(topic_hierarchy)
@@ -327,7 +582,7 @@ def validate(ctx, topic_hierarchy, logfile, verbosity, strict=True):
 
     setup_logger(verbosity, logfile)
 
-    th = TopicHierarchy()
+    th = TopicHierarchy.instance()
 
     if th.validate(topic_hierarchy, strict=strict):
         click.echo('Valid')
@@ -335,5 +590,31 @@ def validate(ctx, topic_hierarchy, logfile, verbosity, strict=True):
         click.echo('Invalid')
 
 
+@click.command('validate-bulk')
+@click.pass_context
+@get_cli_common_options
+@click.option('--strict/--no-strict', default=True,
+              help='Validate in strict mode')
+@click.argument('topic-hierarchies', type=click.File())
+def validate_bulk(ctx, topic_hierarchies, logfile, verbosity, strict=True):
+    """Validate topic hierarchies from a file (one per line)"""
+
+    setup_logger(verbosity, logfile)
+
+    th = TopicHierarchy.instance()
+
+    topic_hierarchies_ = [line.strip() for line in topic_hierarchies
+                          if line.strip()]
+
+    results = th.validate_many(topic_hierarchies_, strict=strict)
+
+    for topic_hierarchy, result in zip(topic_hierarchies_, results):
+        if result:
+            click.echo(f'{topic_hierarchy}: Valid')
+        else:
+            click.echo(f'{topic_hierarchy}: Invalid')
+
+
 topic.add_command(list_)
 topic.add_command(validate)
+topic.add_command(validate_bulk)
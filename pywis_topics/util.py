@@ -21,6 +21,7 @@
 
 import logging
 from pathlib import Path
+import re
 import ssl
 import sys
 from typing import Union
@@ -30,6 +31,13 @@ from urllib.request import urlopen
 
 LOGGER = logging.getLogger(__name__)
 
+# numeric literals as accepted by int() and float() (once stripped), with
+# digits optionally grouped by single underscores
+_DIGITS = r'\d(?:_?\d)*'
+INT_PATTERN = re.compile(rf'[+-]?{_DIGITS}')
+FLOAT_PATTERN = re.compile(
+    rf'[+-]?({_DIGITS}\.(?:{_DIGITS})?|\.{_DIGITS})([eE][+-]?{_DIGITS})?')
+
 
 def get_typed_value(value) -> Union[float, int, str]:
     """
@@ -40,14 +48,15 @@ def get_typed_value(value) -> Union[float, int, str]:
     :returns: value as a native Python data type
     """
 
-    try:
-        if '.' in value:  # float?
-            value2 = float(value)
-        elif len(value) > 1 and value.startswith('0'):
-            value2 = value
-        else:  # int?
-            value2 = int(value)
-    except ValueError:  # string (default)?
+    stripped = value.strip()
+
+    if FLOAT_PATTERN.fullmatch(stripped):  # float?
+        value2 = float(value)
+    elif len(value) > 1 and value.startswith('0'):
+        value2 = value
+    elif INT_PATTERN.fullmatch(stripped):  # int?
+        value2 = int(value)
+    else:  # string (default)
         value2 = value
 
     return value2
@@ -63,6 +72,11 @@ def get_userdir() -> str:
     return Path.home() / '.pywis-topics'
 
 
+USERDIR = get_userdir()
+
+WIS2_TOPIC_HIERARCHY_LOOKUP = USERDIR / 'wis2-topic-hierarchy'
+
+
 def get_cli_common_options(function):
     """
     Define common CLI options
@@ -92,6 +106,9 @@ def setup_logger(loglevel: str = None, logfile: str = None) -> None:
     if loglevel is None and logfile is None:  # no logging
         return
 
+    if logging.getLogger().hasHandlers():  # logging already configured
+        return
+
     if loglevel is None and logfile is not None:
         loglevel = 'INFO'
 
@@ -99,16 +116,7 @@ def setup_logger(loglevel: str = None, logfile: str = None) -> None:
         '[%(asctime)s] %(levelname)s - %(message)s'
     date_format = '%Y-%m-%dT%H:%M:%SZ'
 
-    loglevels = {
-        'CRITICAL': logging.CRITICAL,
-        'ERROR': logging.ERROR,
-        'WARNING': logging.WARNING,
-        'INFO': logging.INFO,
-        'DEBUG': logging.DEBUG,
-        'NOTSET': logging.NOTSET,
-    }
-
-    loglevel = loglevels[loglevel]
+    loglevel = getattr(logging, loglevel)
 
     if logfile is not None:  # log to file
         logging.basicConfig(level=loglevel, datefmt=date_format,
@@ -19,10 +19,16 @@
 #
 ###############################################################################
 
+from pathlib import Path
+from tempfile import TemporaryDirectory
 import unittest
 
+from click.testing import CliRunner
+
 from pywis_topics.centre_id import CentreId
-from pywis_topics.topics import TopicHierarchy
+from pywis_topics.topics import (TOPIC_LEVELS, TopicHierarchy, _load_topics,
+                                 validate_bulk)
+from pywis_topics.util import get_typed_value
 
 
 class WIS2CentreIdTest(unittest.TestCase):
@@ -75,6 +81,28 @@ class WIS2TopicHierarchyTest(unittest.TestCase):
         """return to pristine state"""
         pass
 
+    def test_instance(self):
+        th = TopicHierarchy.instance()
+        self.assertIs(th, TopicHierarchy.instance())
+        self.assertEqual(th.topics, self.th.topics)
+
+    def test_load_level(self):
+        with TemporaryDirectory() as tmpdir:
+            tables_dir = Path(tmpdir)
+            for topic_level in TOPIC_LEVELS:
+                filename = tables_dir / f'{topic_level}.csv'
+                filename.write_text('Name,Description\n')
+
+            (tables_dir / 'channel.csv').write_text(
+                'Name,Description\n'
+                'cache,"Global cache, by\nWIS2 centre"\n'
+                '"origin",Origin\n'
+            )
+
+            topics = _load_topics(tables_dir, tables_dir.stat().st_mtime)
+
+        self.assertEqual(topics[0], frozenset(['cache', 'origin']))
+
     def test_validate(self):
         value = None
         with self.assertRaises(ValueError):
@@ -121,6 +149,17 @@ class WIS2TopicHierarchyTest(unittest.TestCase):
         value = 'cache/a/wis2/+/data/#/weather'
         self.assertFalse(self.th.validate(value))
 
+        value = 'cache/a/wis2/+/data/#/weather/+'
+        self.assertFalse(self.th.validate(value, strict=False))
+
+        value = 'cache/a/wis2/+/data/core/weather/+'
+        self.assertTrue(self.th.validate(value, strict=False))
+        self.assertFalse(self.th.validate(value))
+
+        value = 'cache/a/wis2/+/data/core/+/surface-based-observations'
+        self.assertTrue(self.th.validate(value, strict=False))
+        self.assertFalse(self.th.validate(value))
+
         value = 'cache/a/wis2/+/data/core/weather/surface-based-observations'
         self.assertTrue(self.th.validate(value, strict=False))
         self.assertFalse(self.th.validate(value))
@@ -147,9 +186,39 @@ class WIS2TopicHierarchyTest(unittest.TestCase):
         self.assertTrue(self.th.validate(value))
 
         value = 'cache/a/wis2/ca-eccc-msc/data/core/weather/surface-based-observations/#'  # noqa
+        self.assertTrue(self.th.validate(value, strict=None))
         self.assertTrue(self.th.validate(value, strict=False))
         self.assertFalse(self.th.validate(value))
 
+    def test_validate_many(self):
+        values = [
+            'cache/a/wis2',
+            'invalid/topic/hierarchy',
+            'cache/a/wis2/+/data/core'
+        ]
+
+        self.assertEqual(self.th.validate_many(values), [True, False, False])
+        self.assertEqual(self.th.validate_many(values, strict=False),
+                         [True, False, True])
+
+        self.assertEqual(self.th.validate_many([]), [])
+
+        self.assertEqual(self.th.validate_many(['/', 'cache/a/wis2']),
+                         [False, True])
+
+    def test_validate_bulk(self):
+        runner = CliRunner()
+
+        topics = 'cache/a/wis2\n/\n\ninvalid/topic/hierarchy\n'
+        result = runner.invoke(validate_bulk, ['-'], input=topics)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.stdout.splitlines(), [
+            'cache/a/wis2: Valid',
+            '/: Invalid',
+            'invalid/topic/hierarchy: Invalid'
+        ])
+
     def test_list_children(self):
         value = None
         with self.assertRaises(ValueError):
@@ -165,7 +234,46 @@ class WIS2TopicHierarchyTest(unittest.TestCase):
 
         value = 'cache'
         children = self.th.list_children(value)
-        self.assertEqual(children, ['a'])
+        self.assertEqual(children, ('a',))
+
+        with self.assertRaises(AttributeError):
+            children.append('bogus')
+
+        self.assertEqual(self.th.list_children(value), ('a',))
+
+
+class WIS2UtilTest(unittest.TestCase):
+    """WIS2 utility tests"""
+
+    def test_get_typed_value(self):
+        values = [
+            ('0', 0),
+            ('5', 5),
+            ('-3', -3),
+            ('+4', 4),
+            ('-05', -5),
+            (' 5', 5),
+            ('1_000', 1000),
+            ('1.5', 1.5),
+            ('1.', 1.0),
+            ('.5', 0.5),
+            ('00.5', 0.5),
+            ('-0.2', -0.2),
+            ('1.5e3', 1500.0),
+            (' 1.5', 1.5),
+            ('01', '01'),
+            ('05 ', '05 '),
+            ('1e5', '1e5'),
+            ('1.2.3', '1.2.3'),
+            ('1__000', '1__000'),
+            ('abc', 'abc'),
+            ('', '')
+        ]
+
+        for value, expected in values:
+            result = get_typed_value(value)
+            self.assertEqual(result, expected)
+            self.assertIs(type(result), type(expected))
 
 
 if __name__ == '__main__':